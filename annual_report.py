@@ -0,0 +1,705 @@
+"""Annual PDF reports (ReportLab tables and charts) for parsed evaluations.
+
+Kept free of Streamlit imports: the reports are rendered in worker processes,
+and a spawned worker only has to import this module (and ``evaluation_parser``)
+to run ``render_annual_pdf``.
+"""
+import io
+import logging
+import math
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.graphics.shapes import Drawing, Group, Line, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.widgets.markers import makeMarker
+
+from evaluation_parser import ITEM_MEAN_KEYS, create_short_name
+
+logger = logging.getLogger(__name__)
+
+# A spawned report worker needs up to a second to start (a fresh interpreter importing
+# ReportLab, numpy and pandas), while one academic year renders in well under 0.1 s,
+# so the process pool only pays off for large batches of reports
+PROCESS_POOL_MIN_JOBS = 16
+
+# Characters stripped from instructor names when building PDF filenames
+FILENAME_UNSAFE_RE = re.compile(r'[^\w\-_]')
+
+# Terms in academic-year order (Fall starts the year)
+TERM_ORDER = ('Fall', 'Winter', 'Spring', 'Summer')
+
+# Very short abbreviations of known survey item names, for table headers
+ABBREVIATED_HEADERS = {
+    "Explained clearly": "Explained",
+    "Effective teaching methods": "Teaching",
+    "Respectful interaction": "Respectful",
+    "Knowledgeable": "Knowledge",
+    "Overall rating": "Overall"
+}
+
+# Colors shared by the PDF charts
+CHART_BAR_COLORS = ['#2c5aa0', '#3d6bb3', '#5a7fb8', '#7a9bc4', '#9ab5d0']
+CHART_GRID_COLOR = colors.Color(0.5, 0.5, 0.5, alpha=0.3)
+CHART_TARGET_COLOR = colors.Color(0, 0.5, 0, alpha=0.5)
+
+# Paragraph styles for the annual PDF reports, built once
+SAMPLE_STYLES = getSampleStyleSheet()
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=SAMPLE_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#1f4788'),
+    spaceAfter=15,
+    alignment=TA_CENTER,
+    leading=28
+)
+SUBTITLE_STYLE = ParagraphStyle(
+    'Subtitle',
+    parent=SAMPLE_STYLES['Normal'],
+    fontSize=14,
+    textColor=colors.HexColor('#5a7fb8'),
+    spaceAfter=25,
+    alignment=TA_CENTER,
+    leading=18
+)
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=SAMPLE_STYLES['Heading2'],
+    fontSize=16,
+    textColor=colors.HexColor('#2c5aa0'),
+    spaceAfter=10,
+    spaceBefore=25
+)
+TERM_STYLE = ParagraphStyle(
+    'TermHeading',
+    parent=SAMPLE_STYLES['Heading2'],
+    fontSize=15,
+    textColor=colors.HexColor('#1f4788'),
+    spaceAfter=10,
+    spaceBefore=20,
+    borderWidth=0,
+    borderPadding=5,
+    backColor=colors.HexColor('#e8eef5')
+)
+SUMMARY_STYLE = ParagraphStyle(
+    'Summary',
+    parent=SAMPLE_STYLES['Normal'],
+    fontSize=10,
+    textColor=colors.HexColor('#666666'),
+    spaceAfter=8,
+    alignment=TA_LEFT
+)
+HEADER_STYLE = ParagraphStyle(
+    'TableHeader',
+    parent=SAMPLE_STYLES['Normal'],
+    fontSize=9,
+    textColor=colors.whitesmoke,
+    fontName='Helvetica-Bold',
+    alignment=TA_CENTER,
+    leading=10
+)
+SECTION_HEADING_STYLE = ParagraphStyle(
+    'SectionHeading',
+    parent=SAMPLE_STYLES['Heading1'],
+    fontSize=18,
+    textColor=colors.HexColor('#1f4788'),
+    spaceAfter=15,
+    spaceBefore=10,
+    alignment=TA_CENTER
+)
+COURSE_HEADER_STYLE = ParagraphStyle(
+    'CourseHeader',
+    parent=SAMPLE_STYLES['Heading2'],
+    fontName='Helvetica-Bold',
+    fontSize=12,
+    textColor=colors.HexColor('#2c5aa0'),
+    spaceAfter=8,
+    spaceBefore=12
+)
+
+# Table styles for the annual PDF reports
+ROW_BACKGROUND_COLORS = [colors.white, colors.HexColor('#f5f7fa')]
+# The course tables always have a header, five survey item rows and an Overall row
+COURSE_TABLE_ROWS = 7
+
+def row_background_commands(first_row, last_row):
+    """Alternating per-row BACKGROUND commands, as ROWBACKGROUNDS would draw them."""
+    return [
+        ('BACKGROUND', (0, row), (-1, row), ROW_BACKGROUND_COLORS[(row - first_row) % len(ROW_BACKGROUND_COLORS)])
+        for row in range(first_row, last_row + 1)
+    ]
+
+# Term summary table
+TERM_TABLE_STYLE = TableStyle([
+    # Header row - enhanced with more padding for rotated text
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f4788')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+    ('LEFTPADDING', (0, 0), (-1, 0), 4),
+    ('RIGHTPADDING', (0, 0), (-1, 0), 4),
+    ('LINEBELOW', (0, 0), (-1, 0), 2, colors.HexColor('#0d3d6b')),
+    # Data rows - enhanced readability
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),  # Course (combined)
+    ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Enrollment
+    ('ALIGN', (2, 1), (-1, -1), 'CENTER'),  # All numeric columns
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (0, -1), 8.5),  # Course column slightly smaller
+    ('FONTSIZE', (1, 1), (-1, -1), 9),  # Other columns
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('LEFTPADDING', (0, 1), (-1, -1), 4),
+    ('RIGHTPADDING', (0, 1), (-1, -1), 4),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d0d0d0')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), ROW_BACKGROUND_COLORS),
+    ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
+    # Add color coding for high ratings (4.0+)
+    ('TEXTCOLOR', (2, 1), (6, -1), colors.HexColor('#2d5a27')),  # Green for item means
+    ('TEXTCOLOR', (7, 1), (7, -1), colors.HexColor('#1f4788')),  # Blue for overall
+    # Left border for first column
+    ('LINEBEFORE', (0, 0), (0, -1), 1, colors.HexColor('#e0e0e0')),
+])
+
+# Course info table
+INFO_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8eef5')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+# Survey item statistics table
+ITEMS_TABLE_STYLE = TableStyle([
+    # Header
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('TOPPADDING', (0, 0), (-1, 0), 6),
+    # Data rows
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    # Fixed row count, so the striping is spelled out per row
+    *row_background_commands(1, COURSE_TABLE_ROWS - 1),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    # Overall row styling
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e8eef5')),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+])
+
+# Response distribution table
+DIST_TABLE_STYLE = TableStyle([
+    # Header
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#5a7fb8')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('TOPPADDING', (0, 0), (-1, 0), 6),
+    # Data rows
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    # Fixed row count, so the striping is spelled out per row
+    *row_background_commands(1, COURSE_TABLE_ROWS - 1),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    # Overall row
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e8eef5')),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+])
+
+def measure_row_heights(style, n_cols):
+    """Measure the header and body row heights of a single-line string table."""
+    sample = Table([[''] * n_cols] * 2, style=style)
+    sample.wrap(0, 0)
+    return sample._rowHeights[0], sample._rowHeights[1]
+
+
+# Every cell in the course tables is a single line, so their row heights are
+# fixed and can be passed to Table() instead of being recomputed per course.
+INFO_ROW_HEIGHT = measure_row_heights(INFO_TABLE_STYLE, 2)[1]
+ITEMS_HEADER_HEIGHT, ITEMS_ROW_HEIGHT = measure_row_heights(ITEMS_TABLE_STYLE, 6)
+DIST_HEADER_HEIGHT, DIST_ROW_HEIGHT = measure_row_heights(DIST_TABLE_STYLE, 6)
+
+# '%.2f' labels for every two-decimal value from 0.00 to 5.00, the range of the means and SDs
+TWO_DECIMAL_LABELS = np.array([f"{hundredths / 100:.2f}" for hundredths in range(501)])
+
+# Numeric cells of the course tables, row by row, as (result key, printf-style format)
+# (the term summary uses the first item's response rate as representative)
+TERM_TABLE_CELLS = [
+    [('Enrollment', '%d'), *((ITEM_MEAN_KEYS[item_num], '%.2f') for item_num in range(1, 6)),
+     ('Overall_Mean', '%.2f'), ('Item_1_Response_Rate', '%d%%')]
+]
+PCT_FIELDS = ('Pct_Strongly_Agree', 'Pct_Agree', 'Pct_Neutral', 'Pct_Disagree', 'Pct_Strongly_Disagree')
+ITEMS_TABLE_CELLS = [
+    [(f'Item_{item_num}_Mean', '%.2f'), (f'Item_{item_num}_SD', '%.2f'), (f'Item_{item_num}_N', '%d'),
+     (f'Item_{item_num}_Rank', '%d'), (f'Item_{item_num}_Response_Rate', '%d%%')]
+    for item_num in range(1, 6)
+] + [[('Overall_Mean', '%.2f'), ('Overall_SD', '%.2f'), ('Overall_N', '%d')]]
+DIST_TABLE_CELLS = [
+    [(f'{prefix}_{field}', '%d%%') for field in PCT_FIELDS]
+    for prefix in [*(f'Item_{item_num}' for item_num in range(1, 6)), 'Overall']
+]
+
+@lru_cache(maxsize=64)
+def create_abbreviated_header(short_name):
+    """Create an abbreviated header name for table columns."""
+    # Check if we have a direct mapping
+    abbreviation = ABBREVIATED_HEADERS.get(short_name)
+    if abbreviation is not None:
+        return abbreviation
+    
+    # Fallback: use first word or first few letters
+    words = short_name.split()
+    if len(words) > 0:
+        return words[0][:8]  # First 8 characters of first word
+    return short_name[:8]
+
+def truncate_text(text, limit):
+    """Shorten text to at most limit characters, ending with an ellipsis."""
+    if len(text) > limit:
+        return text[:limit - 3] + '...'
+    return text
+
+def generate_annual_pdf_filename(instructor_name, academic_year):
+    """Generate filename for annual PDF report."""
+    instructor_lastname = instructor_name.split(',')[0].strip() if instructor_name else 'UNKNOWN'
+    instructor_lastname = FILENAME_UNSAFE_RE.sub('', instructor_lastname)
+    return f"{instructor_lastname}_{academic_year}.pdf"
+
+def create_term_chart(term_data, survey_items, term_name):
+    """Create a bar chart showing average ratings for each survey item across all courses in a term."""
+    # Calculate average for each item across all courses (0 where no course has a value)
+    means = np.array(
+        [[course.get(ITEM_MEAN_KEYS[item_num], np.nan) for item_num in range(1, 6)] for course in term_data],
+        dtype=float
+    ).reshape(-1, 5)
+    counts = (~np.isnan(means)).sum(axis=0)
+    item_means = np.divide(np.nansum(means, axis=0), counts, out=np.zeros(5), where=counts > 0)
+    
+    # Get item names
+    item_names = []
+    for item_num in range(1, 6):
+        if item_num in survey_items:
+            item_name = create_short_name(survey_items[item_num])
+            # Truncate long names
+            if len(item_name) > 20:
+                item_name = item_name[:17] + '...'
+            item_names.append(item_name)
+        else:
+            item_names.append(f'Item {item_num}')
+    
+    # Draw the chart as vector graphics, sized like the image it replaced
+    drawing = Drawing(5.5*inch, 3.2*inch)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 50, 60
+    chart.width, chart.height = drawing.width - 65, drawing.height - 95
+    chart.data = [item_means.tolist()]
+    chart.barWidth = 8
+    chart.groupSpacing = 12
+    chart.bars.strokeColor = None
+    for i, color in enumerate(CHART_BAR_COLORS):
+        chart.bars[(0, i)].fillColor = colors.HexColor(color)
+    
+    # Add value labels on bars
+    chart.barLabelFormat = '%.2f'
+    chart.barLabels.nudge = 7
+    chart.barLabels.fontName = 'Helvetica-Bold'
+    chart.barLabels.fontSize = 8
+    
+    chart.categoryAxis.categoryNames = item_names
+    chart.categoryAxis.labels.angle = 15
+    chart.categoryAxis.labels.boxAnchor = 'ne'
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 8
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = 5.5
+    chart.valueAxis.valueStep = 1
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.visibleGrid = True
+    chart.valueAxis.gridStrokeColor = CHART_GRID_COLOR
+    chart.valueAxis.gridStrokeDashArray = (2, 2)
+    drawing.add(chart)
+    
+    # Target line at 4.0
+    target_y = chart.y + chart.height * 4.0 / 5.5
+    drawing.add(Line(chart.x, target_y, chart.x + chart.width, target_y,
+                     strokeColor=CHART_TARGET_COLOR, strokeDashArray=(4, 2)))
+    
+    drawing.add(String(drawing.width / 2, drawing.height - 18, f'{term_name} - Average Ratings by Survey Item',
+                       fontName='Helvetica-Bold', fontSize=10, textAnchor='middle'))
+    axis_label = Group(String(0, 0, 'Average Rating', fontName='Helvetica-Bold', fontSize=9, textAnchor='middle'))
+    axis_label.translate(22, chart.y + chart.height / 2)
+    axis_label.rotate(90)
+    drawing.add(axis_label)
+    
+    return drawing
+
+def create_overall_trend_chart(year_data, academic_year):
+    """Create a line chart showing overall rating trends across terms."""
+    terms = []
+    overall_means = []
+    
+    for term in TERM_ORDER:
+        if term in year_data and year_data[term]:
+            term_courses = year_data[term]
+            values = []
+            for course in term_courses:
+                overall = course.get('Overall_Mean', math.nan)
+                if not math.isnan(overall):
+                    values.append(overall)
+            if values:
+                terms.append(term)
+                overall_means.append(sum(values) / len(values))
+    
+    if len(terms) < 2:
+        return None  # Need at least 2 points for a trend
+    
+    drawing = Drawing(6*inch, 3*inch)
+    chart = HorizontalLineChart()
+    chart.x, chart.y = 50, 30
+    chart.width, chart.height = drawing.width - 65, drawing.height - 65
+    chart.data = [overall_means]
+    chart.joinedLines = True
+    chart.lines[0].strokeColor = colors.HexColor('#2c5aa0')
+    chart.lines[0].strokeWidth = 2.5
+    marker = makeMarker('FilledCircle')
+    marker.size = 7
+    marker.fillColor = colors.HexColor('#5a7fb8')
+    marker.strokeColor = colors.HexColor('#1f4788')
+    marker.strokeWidth = 2
+    chart.lines[0].symbol = marker
+    
+    # Add value labels
+    chart.lineLabelFormat = '%.2f'
+    chart.lineLabels.fontName = 'Helvetica-Bold'
+    chart.lineLabels.fontSize = 8
+    chart.lineLabels.dy = 6
+    
+    chart.categoryAxis.categoryNames = terms
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 8
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = 5.5
+    chart.valueAxis.valueStep = 1
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.visibleGrid = True
+    chart.valueAxis.gridStrokeColor = CHART_GRID_COLOR
+    chart.valueAxis.gridStrokeDashArray = (2, 2)
+    drawing.add(chart)
+    
+    # Target line at 4.0
+    target_y = chart.y + chart.height * 4.0 / 5.5
+    drawing.add(Line(chart.x, target_y, chart.x + chart.width, target_y,
+                     strokeColor=CHART_TARGET_COLOR, strokeDashArray=(4, 2)))
+    
+    drawing.add(String(drawing.width / 2, drawing.height - 18, f'Academic Year {academic_year} - Overall Rating Trend',
+                       fontName='Helvetica-Bold', fontSize=10, textAnchor='middle'))
+    axis_label = Group(String(0, 0, 'Average Overall Rating', fontName='Helvetica-Bold', fontSize=9, textAnchor='middle'))
+    axis_label.translate(22, chart.y + chart.height / 2)
+    axis_label.rotate(90)
+    drawing.add(axis_label)
+    
+    return drawing
+
+def format_column(column, fmt):
+    """Format a float array with a printf-style format.
+    Two-decimal columns on the 0.00-5.00 rating scale are read from TWO_DECIMAL_LABELS.
+    """
+    if fmt == '%.2f':
+        hundredths = np.rint(column * 100)
+        if ((hundredths / 100 == column) & (hundredths >= 0) & (hundredths <= 500)).all():
+            return TWO_DECIMAL_LABELS[hundredths.astype(int)]
+    return np.char.mod(fmt, column)
+
+def format_table_cells(courses, rows):
+    """Format the numeric table cells of every course in one vectorized pass.
+    rows lists each table row's (result key, format) cells; returns the formatted
+    rows per course, with 'N/A' where a value is missing.
+    """
+    cells = [cell for row in rows for cell in row]
+    values = pd.DataFrame.from_records(courses, columns=[key for key, _ in cells]).to_numpy(dtype=float)
+    missing = np.isnan(values)
+    values = np.where(missing, 0, values)
+    text = np.column_stack([format_column(values[:, col], fmt) for col, (_, fmt) in enumerate(cells)])
+    text = np.where(missing, 'N/A', text).tolist()
+    
+    bounds = np.cumsum([0, *map(len, rows)]).tolist()
+    spans = list(zip(bounds, bounds[1:]))
+    return [[course_text[start:end] for start, end in spans] for course_text in text]
+
+def create_term_summary_table(term_data, survey_items):
+    """Create a summary table for all courses in a term.
+    Returns table data ready for ReportLab Table.
+    """
+    # Build header row with abbreviated names
+    header = ['Course', 'Enroll']
+    
+    # Add item mean columns with abbreviated names
+    for item_num in range(1, 6):
+        if item_num in survey_items:
+            item_name = create_short_name(survey_items[item_num])
+            abbrev = create_abbreviated_header(item_name)
+        else:
+            abbrev = f'Item{item_num}'
+        header.append(abbrev)
+    
+    header.append('Overall')
+    header.append('Resp %')
+    
+    # Build data rows
+    rows = [header]
+    
+    # Enrollment, item means, overall mean and response rate, formatted for all courses at once
+    term_cells = format_table_cells(term_data, TERM_TABLE_CELLS)
+    
+    for course, (cells,) in zip(term_data, term_cells):
+        # Combine Course Code and Name, truncate name to save space
+        course_code = course.get('Course_Code', 'N/A')
+        course_name = course.get('Course_Name', 'N/A')
+        # Limit course name to 25 characters
+        if len(course_name) > 25:
+            course_name = course_name[:22] + '...'
+        # Combine: "CODE: Name"
+        combined = f"{course_code}: {course_name}" if course_name != 'N/A' else course_code
+        rows.append([combined, *cells])
+    
+    return rows
+
+def generate_annual_pdf_report(year_data, instructor_name, academic_year, survey_items):
+    """Generate a professional annual PDF report for an academic year, organized by term.
+    year_data: dict with structure {term: [list of course data]}
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                           rightMargin=0.5*inch, leftMargin=0.5*inch,
+                           topMargin=0.75*inch, bottomMargin=0.75*inch,
+                           pageCompression=1)  # Always deflate page streams, whatever the site's rl_config says
+    
+    elements = []
+    
+    # Title Section with enhanced styling
+    title_text = f"<b>Instructor Evaluation Report</b>"
+    elements.append(Paragraph(title_text, TITLE_STYLE))
+    
+    subtitle_text = f"{instructor_name}<br/>Academic Year {academic_year}"
+    elements.append(Paragraph(subtitle_text, SUBTITLE_STYLE))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Terms with courses, in order: Fall, Winter, Spring, Summer
+    active_terms = [(term, year_data[term]) for term in TERM_ORDER if year_data.get(term)]
+    
+    # Add overall trend chart at the beginning if we have multiple terms
+    trend_chart = create_overall_trend_chart(year_data, academic_year)
+    if trend_chart:
+        elements.append(trend_chart)
+        elements.append(Spacer(1, 0.25*inch))
+    
+    # Process each term in order: Fall, Winter, Spring, Summer
+    for term, term_courses in active_terms:
+        # Term header with background
+        term_year = term_courses[0].get('Year', '')
+        term_header = f"{term} {term_year}"
+        elements.append(Paragraph(term_header, TERM_STYLE))
+        elements.append(Spacer(1, 0.15*inch))
+        
+        # Add term summary statistics
+        total_enrollment = sum(c['Enrollment'] for c in term_courses if not math.isnan(c.get('Enrollment', math.nan)))
+        avg_overall = []
+        for course in term_courses:
+            overall = course.get('Overall_Mean', math.nan)
+            if not math.isnan(overall):
+                avg_overall.append(overall)
+        avg_overall_str = f"{sum(avg_overall)/len(avg_overall):.2f}" if avg_overall else "N/A"
+        
+        summary_text = f"<b>Summary:</b> {len(term_courses)} course(s) | Total Enrollment: {total_enrollment} | Average Overall Rating: {avg_overall_str}"
+        elements.append(Paragraph(summary_text, SUMMARY_STYLE))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        # Add term chart
+        try:
+            term_chart = create_term_chart(term_courses, survey_items, f"{term} {term_year}")
+            elements.append(term_chart)
+            elements.append(Spacer(1, 0.15*inch))
+        except Exception as e:
+            pass  # Skip chart if there's an error
+        
+        # Create summary table for this term with enhanced styling
+        table_data = create_term_summary_table(term_courses, survey_items)
+        
+        if table_data and len(table_data) > 1:
+            # Convert header row to Paragraph objects with rotation for slanted text
+            # Replace header strings with Paragraph objects (rotated text)
+            header_row = table_data[0]
+            rotated_headers = []
+            for header_text in header_row:
+                # Use Paragraph for text wrapping, with slight rotation effect via smaller font
+                # ReportLab doesn't support true rotation in tables, so we'll use wrapped text
+                para = Paragraph(f"<b>{header_text}</b>", HEADER_STYLE)
+                rotated_headers.append(para)
+            
+            # Replace first row with Paragraph objects
+            table_data[0] = rotated_headers
+            
+            # Calculate column widths - adjusted for combined Course column
+            num_cols = len(table_data[0])
+            available_width = 7*inch
+            # New structure: Course (combined), Enroll, 5 items, Overall, Resp %
+            if num_cols == 9:  # Course, Enroll, 5 items, Overall, Resp %
+                col_widths = [2.2*inch, 0.5*inch] + [0.55*inch] * 5 + [0.6*inch, 0.5*inch]
+            else:
+                # Fallback: flexible distribution
+                col_widths = [2.0*inch] + [0.55*inch] * (num_cols - 1)
+            
+            total_width = sum(col_widths)
+            if total_width > available_width:
+                scale = available_width / total_width
+                col_widths = [w * scale for w in col_widths]
+            
+            term_table = Table(table_data, colWidths=col_widths, repeatRows=1)
+            
+            # Enhanced table styling
+            term_table.setStyle(TERM_TABLE_STYLE)
+            elements.append(term_table)
+            elements.append(Spacer(1, 0.3*inch))
+    
+    # Add page break before detailed course breakdowns
+    elements.append(PageBreak())
+    
+    # Detailed Course-by-Course Breakdown Section
+    elements.append(Paragraph("<b>Detailed Course-by-Course Breakdown</b>", SECTION_HEADING_STYLE))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Survey item labels are the same for every course, so truncate them once
+    item_text_items = {i: truncate_text(survey_items.get(i, f"Item {i}"), 50) for i in range(1, 6)}
+    item_text_dist = {i: truncate_text(survey_items.get(i, f"Item {i}"), 30) for i in range(1, 6)}
+    
+    # Process each term again for detailed breakdowns
+    for term, term_courses in active_terms:
+        term_year = term_courses[0].get('Year', '')
+        
+        # Term section header
+        elements.append(Paragraph(f"<b>{term} {term_year}</b>", HEADING_STYLE))
+        elements.append(Spacer(1, 0.15*inch))
+        
+        # Detailed breakdown for each course in this term
+        # Format every course's numbers for this term up front
+        term_items_cells = format_table_cells(term_courses, ITEMS_TABLE_CELLS)
+        term_dist_cells = format_table_cells(term_courses, DIST_TABLE_CELLS)
+        
+        for course, items_cells, dist_cells in zip(term_courses, term_items_cells, term_dist_cells):
+            course_code = course.get('Course_Code', 'N/A')
+            course_name = course.get('Course_Name', 'N/A')
+            instructor = course.get('Instructor', 'N/A')
+            enrollment = course.get('Enrollment', math.nan)
+            semester = course.get('Semester', 'N/A')
+            year = course.get('Year', 'N/A')
+            
+            # Course header (bold comes from the style, so the title needs no markup)
+            elements.append(Paragraph(f"{course_code}: {course_name}", COURSE_HEADER_STYLE))
+            
+            # Course info table
+            info_data = [
+                ['Instructor:', instructor],
+                ['Semester:', f"{semester} {year}"],
+                ['Enrollment:', str(enrollment) if not math.isnan(enrollment) else 'N/A']
+            ]
+            
+            info_table = Table(info_data, colWidths=[1.5*inch, 5.5*inch],
+                               rowHeights=[INFO_ROW_HEIGHT] * len(info_data))
+            info_table.setStyle(INFO_TABLE_STYLE)
+            elements.append(info_table)
+            elements.append(Spacer(1, 0.1*inch))
+            
+            # Survey Items Statistics
+            items_data = [['Survey Item', 'Mean', 'SD', 'N', 'Rank', 'Response Rate']]
+            for item_num, cells in zip(range(1, 6), items_cells):
+                items_data.append([item_text_items[item_num], *cells])
+            items_data.append(['Overall', *items_cells[5], '—', '—'])
+            
+            items_table = Table(items_data, colWidths=[3.5*inch, 0.7*inch, 0.7*inch, 0.6*inch, 0.6*inch, 0.8*inch],
+                                rowHeights=[ITEMS_HEADER_HEIGHT] + [ITEMS_ROW_HEIGHT] * (len(items_data) - 1))
+            items_table.setStyle(ITEMS_TABLE_STYLE)
+            elements.append(items_table)
+            
+            # Response distribution table
+            dist_header = ['Response', 'Strongly Agree', 'Agree', 'Neutral', 'Disagree', 'Strongly Disagree']
+            dist_data = [dist_header]
+            for item_num, cells in zip(range(1, 6), dist_cells):
+                dist_data.append([item_text_dist[item_num], *cells])
+            dist_data.append(['Overall', *dist_cells[5]])
+            
+            dist_table = Table(dist_data, colWidths=[2.5*inch, 0.9*inch, 0.9*inch, 0.9*inch, 0.9*inch, 0.9*inch],
+                               rowHeights=[DIST_HEADER_HEIGHT] + [DIST_ROW_HEIGHT] * (len(dist_data) - 1))
+            dist_table.setStyle(DIST_TABLE_STYLE)
+            
+            elements.append(Spacer(1, 0.1*inch))
+            elements.append(dist_table)
+            elements.append(Spacer(1, 0.2*inch))
+    
+    # Build PDF
+    doc.build(elements)
+    # getvalue() hands back the buffer's own bytes object rather than a copy
+    return buffer.getvalue()
+
+def render_annual_pdf(job):
+    """Render one (year_data, instructor, academic_year, survey_items) report job.
+    Returns (pdf_bytes, filename, course_count, error); a module-level function so it can run in a worker process.
+    """
+    year_data, instructor, academic_year, survey_items = job
+    try:
+        pdf_bytes = generate_annual_pdf_report(year_data, instructor, academic_year, survey_items)
+    except Exception as e:
+        return None, None, 0, str(e)
+    pdf_filename = generate_annual_pdf_filename(instructor, academic_year)
+    # Count total courses in this academic year
+    total_courses = sum(len(courses) for courses in year_data.values())
+    return pdf_bytes, pdf_filename, total_courses, None
+
+def render_annual_pdfs(jobs):
+    """Render report jobs, in worker processes when there are enough of them to pay off."""
+    workers = min(len(jobs), os.cpu_count() or 1)
+    if workers > 1 and len(jobs) >= PROCESS_POOL_MIN_JOBS:
+        try:
+            # Always spawn: forking would copy the multi-threaded Streamlit server
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                return list(executor.map(render_annual_pdf, jobs))
+        except Exception:
+            logger.warning("Could not render annual PDFs in worker processes; rendering them in this process instead",
+                           exc_info=True)
+    return [render_annual_pdf(job) for job in jobs]
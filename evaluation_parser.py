@@ -0,0 +1,299 @@
+"""Parsing of HTML instructor evaluation exports.
+
+Kept free of Streamlit and plotting imports so it can optionally be compiled
+with mypyc (``mypyc evaluation_parser.py``); ``streamlit_app.py`` imports the
+compiled extension automatically when it has been built.
+"""
+import math
+import re
+from html import unescape
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+# Precompiled regular expressions used by the parser
+SEMESTER_RE = re.compile(r'(Winter|Spring|Summer|Fall)\s+(\d{4})')
+ENROLL_RE = re.compile(r'enrollment for course at start of quarter:\s*N\s*=\s*(\d+)', re.IGNORECASE)
+COURSE_RE = re.compile(r'^([A-Z]+\s+\d+[A-Z]?)\s*:\s*')
+INSTRUCTOR_RE = re.compile(r'^([A-Z]+,\s+[A-Z\s]+)$')
+# Course code, course name (possibly wrapped) and the instructor line that ends it, in one
+# search; [^\S\n] is whitespace within a line, so no part can run on past its own line
+HEADER_RE = re.compile(
+    r'^(?P<code>[A-Z]+[^\S\n]+\d+[A-Z]?)[^\S\n]*:[^\S\n]*(?P<name>.*?)\n'
+    r'(?P<instructor>[A-Z]+,[^\S\n]+[A-Z \t]+)$',
+    re.MULTILINE | re.DOTALL
+)
+SURVEY_SECTION_RE = re.compile(r'Instructor Survey Items:\s*\n((?:\d+\.\s+[^\n]+\n?)+)')
+SURVEY_ITEM_RE = re.compile(r'(\d+)\.\s+(.+?)(?:\n|$)')
+# Same character-reference tokens html.unescape finds, including the legacy forms without a
+# trailing ';' (&amp, &nbsp, &#39), so each token decodes exactly as it would there
+HTML_ENTITY_RE = re.compile(r'&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)')
+
+# Item statistics rows, one per line ([^\S\n] also takes the \xa0 that &nbsp; decodes to);
+# the Over All row is searched for anywhere in the text
+ITEM_RE = re.compile(
+    r'^[^\S\n]*(\d+)[^\S\n]+(\d+)[^\S\n]+(\d+(?:\.\d+)?)[^\S\n]+(\d+(?:\.\d+)?)[^\S\n]+(\d+)[^\S\n]+(\d+)%'
+    r'[^\S\n]+(\d+)%[^\S\n]+(\d+)%[^\S\n]+(\d+)%[^\S\n]+(\d+)%[^\S\n]+(\d+)%',
+    re.MULTILINE
+)
+OVERALL_RE = re.compile(r'Over\s*All\s+([\d.]+)\s+([\d.]+)\s+(\d+)\s+(\d+)%\s+(\d+)%\s+(\d+)%\s+(\d+)%\s+(\d+)%')
+
+# The few HTML entities evaluation exports actually contain
+HTML_ENTITIES = {
+    '&amp;': '&',
+    '&lt;': '<',
+    '&gt;': '>',
+    '&quot;': '"',
+    '&#39;': "'",
+    '&apos;': "'",
+    '&nbsp;': '\xa0'
+}
+
+# Semester ranks in calendar order, for sorting results chronologically
+SEMESTER_ORDER = {'Winter': 1, 'Spring': 2, 'Summer': 3, 'Fall': 4}
+
+# Shorter names for the known survey items
+SHORT_NAMES = {
+    "The instructor explained concepts clearly.": "Explained clearly",
+    "The instructor used effective teaching methods.": "Effective teaching methods",
+    "The instructor interacted with students in a respectful, professional manner.": "Respectful interaction",
+    "The instructor was knowledgeable in the subject area.": "Knowledgeable",
+    "Overall, I rate the instructor highly.": "Overall rating"
+}
+
+# Parsed field suffix -> CSV column label, for each survey item and the overall row
+ITEM_COLUMN_FIELDS = (
+    ('Rank', 'Rank'),
+    ('Mean', 'Mean'),
+    ('SD', 'SD'),
+    ('N', 'N'),
+    ('Pct_Strongly_Agree', '% Strongly Agree'),
+    ('Pct_Agree', '% Agree'),
+    ('Pct_Neutral', '% Neutral'),
+    ('Pct_Disagree', '% Disagree'),
+    ('Pct_Strongly_Disagree', '% Strongly Disagree'),
+    ('Response_Rate', 'Response Rate'),
+)
+OVERALL_COLUMN_FIELDS = (
+    ('Mean', 'Mean'),
+    ('SD', 'SD'),
+    ('N', 'N'),
+    ('Pct_Strongly_Agree', '% Strongly Agree'),
+    ('Pct_Agree', '% Agree'),
+    ('Pct_Neutral', '% Neutral'),
+    ('Pct_Disagree', '% Disagree'),
+    ('Pct_Strongly_Disagree', '% Strongly Disagree'),
+)
+# Field suffixes holding whole numbers (kept as nullable integers in the DataFrame)
+INTEGER_FIELDS = {'Rank', 'N', 'Pct_Strongly_Agree', 'Pct_Agree', 'Pct_Neutral',
+                  'Pct_Disagree', 'Pct_Strongly_Disagree', 'Response_Rate'}
+# Converters for ITEM_RE groups 2-11, in ITEM_COLUMN_FIELDS order
+ITEM_CONVERTERS = tuple(int if field in INTEGER_FIELDS else float for field, _ in ITEM_COLUMN_FIELDS)
+# Result keys and converters for the Over All row, in OVERALL_COLUMN_FIELDS order
+OVERALL_KEYS = tuple(f'Overall_{field}' for field, _ in OVERALL_COLUMN_FIELDS)
+OVERALL_CONVERTERS = tuple(int if field in INTEGER_FIELDS else float for field, _ in OVERALL_COLUMN_FIELDS)
+# Template for results without an Over All row
+OVERALL_MISSING = dict.fromkeys(OVERALL_KEYS, math.nan)
+# Result keys per item number, e.g. ITEM_KEYS[1] == ('Item_1_Rank', 'Item_1_Mean', ...)
+ITEM_KEYS = {
+    item_num: tuple(f'Item_{item_num}_{field}' for field, _ in ITEM_COLUMN_FIELDS)
+    for item_num in range(1, 11)
+}
+# Mean key per item number, for consumers that only need the item means
+ITEM_MEAN_KEYS = {item_num: keys[1] for item_num, keys in ITEM_KEYS.items()}
+
+def item_keys(item_num: int) -> Tuple[str, ...]:
+    """Return the result keys for an item number, in ITEM_COLUMN_FIELDS order."""
+    keys = ITEM_KEYS.get(item_num)
+    if keys is None:
+        keys = tuple(f'Item_{item_num}_{field}' for field, _ in ITEM_COLUMN_FIELDS)
+    return keys
+
+def extract_survey_items(text: str) -> Dict[int, str]:
+    """Extract survey item descriptions from the text."""
+    items = {}
+    # Look for "Instructor Survey Items:" followed by numbered items
+    items_section = SURVEY_SECTION_RE.search(text)
+    if items_section:
+        items_text = items_section.group(1)
+        # Extract each numbered item
+        for match in SURVEY_ITEM_RE.finditer(items_text):
+            item_num = int(match.group(1))
+            item_text = match.group(2).strip()
+            items[item_num] = item_text
+    return items
+
+@lru_cache(maxsize=64)
+def create_short_name(full_text: str) -> str:
+    """Create a shorter, CSV-friendly name from the full survey item text."""
+    # Check if we have a direct mapping
+    short_name = SHORT_NAMES.get(full_text)
+    if short_name is not None:
+        return short_name
+    
+    # Fallback: remove "The instructor" prefix and capitalize
+    short = full_text.replace('The instructor ', '').replace('the instructor ', '')
+    # Remove trailing period
+    short = short.rstrip('.')
+    # Capitalize first letter
+    if short:
+        short = short[0].upper() + short[1:] if len(short) > 1 else short.upper()
+    return short
+
+def decode_entity(match: "re.Match[str]") -> str:
+    """Decode one HTML entity, using the generic decoder only for uncommon ones."""
+    entity = match.group(0)
+    return HTML_ENTITIES.get(entity) or unescape(entity)
+
+def unescape_entities(text: str) -> str:
+    """Decode HTML entities without running the full html.unescape tokenizer."""
+    if '&' not in text:
+        return text  # Most exports have no entities; skip the regex scan entirely
+    return HTML_ENTITY_RE.sub(decode_entity, text)
+
+def find_pre_bounds(content: Any) -> Optional[Tuple[int, int]]:
+    """Return the (start, end) offsets of the first <pre> block body in str or bytes content, or None if missing."""
+    # Plain substring search, no regex needed
+    tags: Any = (b'<pre', b'>', b'</pre>') if isinstance(content, bytes) else ('<pre', '>', '</pre>')
+    open_tag, tag_end, close_tag = tags
+    pre_start = content.find(open_tag)
+    if pre_start < 0:
+        return None
+    body_start = content.find(tag_end, pre_start) + 1
+    if body_start == 0:
+        return None
+    body_end = content.find(close_tag, body_start)
+    if body_end < 0:
+        return None
+    return body_start, body_end
+
+def find_pre_block(content: Any) -> Any:
+    """Return the body of the first <pre> block in str or bytes content, or None if missing."""
+    bounds = find_pre_bounds(content)
+    if bounds is None:
+        return None
+    return content[bounds[0]:bounds[1]]
+
+def parse_evaluation_content(content: str, filename: str = "") -> Optional[Dict[str, Any]]:
+    """Parse evaluation file content and extract all data."""
+    text = find_pre_block(content)
+    if text is None:
+        return None
+    return parse_evaluation_text(text, filename)
+
+def parse_evaluation_bytes(raw: bytes, filename: str = "") -> Optional[Dict[str, Any]]:
+    """Parse raw evaluation file bytes, decoding only the <pre> block."""
+    bounds = find_pre_bounds(raw)
+    if bounds is None:
+        return None
+    # Decode through a memoryview so the body is not copied into a bytes slice first
+    return parse_evaluation_text(str(memoryview(raw)[bounds[0]:bounds[1]], 'utf-8'), filename)
+
+def scan_header_lines(text: str) -> Tuple[Optional[str], Optional[str], str]:
+    """Find the course code, course name and instructor line by line.
+    Returns (code, name, instructor); code and name are None when there is no course code line.
+    """
+    course_code_match = None
+    course_name_lines = []
+    course_name = None
+    instructor = ''
+    for line in text.splitlines():
+        if not line or line.isspace():
+            continue
+        
+        # Instructor name (LASTNAME, FIRSTNAME): the first one after the course code ends the
+        # course name and is the instructor
+        if line[0].isupper() and ',' in line:
+            instructor_match = INSTRUCTOR_RE.match(line)
+            if instructor_match:
+                if course_code_match:
+                    instructor = instructor_match.group(1).strip()
+                    course_name = '\n'.join(course_name_lines)
+                    break
+                if not instructor:
+                    # Name before any course code; kept in case no course code follows
+                    instructor = instructor_match.group(1).strip()
+                continue
+        
+        # Course code and name (CODE 123: Name, possibly wrapped onto following lines)
+        if course_code_match is None:
+            if line[0].isupper() and ':' in line:
+                course_code_match = COURSE_RE.match(line)
+                if course_code_match:
+                    course_name_lines.append(line[course_code_match.end():])
+        else:
+            course_name_lines.append(line)
+    
+    if course_code_match is None:
+        return None, None, instructor
+    if course_name is None:
+        # Fallback: no instructor line followed, just use the rest of the line
+        course_name = course_name_lines[0]
+    return course_code_match.group(1), course_name, instructor
+
+def parse_evaluation_text(text: str, filename: str = "") -> Dict[str, Any]:
+    """Extract all data from the text of an evaluation's <pre> block."""
+    text = unescape_entities(text)  # Handle HTML entities like &amp;
+    
+    # Initialize result dictionary
+    result: Dict[str, Any] = {}
+    result['_filename'] = filename
+    
+    # Item statistics, found in one pass over the whole text
+    for match in ITEM_RE.finditer(text):
+        groups = match.groups()
+        for key, convert, value in zip(item_keys(int(groups[0])), ITEM_CONVERTERS, groups[1:]):
+            result[key] = convert(value)
+    
+    # Semester, year and enrollment
+    semester_match = SEMESTER_RE.search(text)
+    if semester_match:
+        result['Semester'] = semester_match.group(1)
+        result['Year'] = int(semester_match.group(2))
+        # Chronological sort key, so results can be ordered on one number
+        result['_sort_key'] = result['Year'] * 10 + SEMESTER_ORDER[result['Semester']]
+    else:
+        result['Semester'] = ''
+        result['Year'] = math.nan
+        result['_sort_key'] = math.nan
+    
+    enrollment_match = ENROLL_RE.search(text)
+    if enrollment_match:
+        result['Enrollment'] = int(enrollment_match.group(1))
+    else:
+        result['Enrollment'] = math.nan
+    
+    # Course code, name and instructor, with a line scan for headers the combined pattern misses
+    header_match = HEADER_RE.search(text)
+    if header_match:
+        course_code: Optional[str] = header_match.group('code')
+        course_name: Optional[str] = header_match.group('name')
+        instructor = header_match.group('instructor').strip()
+    else:
+        course_code, course_name, instructor = scan_header_lines(text)
+    
+    if course_code is not None and course_name is not None:
+        result['Course_Code'] = course_code.strip()
+        # Clean up course name - remove extra whitespace and newlines
+        result['Course_Name'] = ' '.join(course_name.split())
+    else:
+        result['Course_Code'] = ''
+        result['Course_Name'] = ''
+    
+    # Extract instructor name
+    result['Instructor'] = instructor
+    
+    # Extract survey items for column naming
+    survey_items = extract_survey_items(text)
+    
+    # Store survey items in result
+    result['_survey_items'] = survey_items
+    
+    # Parse overall statistics
+    overall_match = OVERALL_RE.search(text)
+    if overall_match:
+        for key, convert, value in zip(OVERALL_KEYS, OVERALL_CONVERTERS, overall_match.groups()):
+            result[key] = convert(value)
+    else:
+        result.update(OVERALL_MISSING)
+    
+    return result